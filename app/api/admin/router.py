@@ -0,0 +1,18 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+
+from app.models.pydantic.logging.log_record import LogRecord
+from app.services.logging_service.service import get_log_sink
+from app.services.logging_service.sinks import LogSink, MemoryLogSink
+
+router = APIRouter(prefix='/admin')
+
+
+@router.get('/logs', response_model=List[LogRecord])
+async def get_logs(limit: int = Query(100, ge=1, le=10000),
+                   status: Optional[str] = None,
+                   sink: LogSink = Depends(get_log_sink)) -> List[LogRecord]:
+    if not isinstance(sink, MemoryLogSink):
+        raise HTTPException(status_code=404, detail="Log inspection requires LOG_SINK=memory")
+    return sink.get_records(limit=limit, status=status)
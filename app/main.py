@@ -5,23 +5,34 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
+from app.api.admin.router import router as admin_router
 from app.api.process_data.router import router as process_data_router
 from app.services.database import get_database
+from app.services.logging_service.service import get_log_sink, get_log_sink_name, close_log_sinks, logging_enabled
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    if os.getenv("CLICKHOUSE_URL") is not None:
-        db = get_database()
-        db.create_tables()
-    else:
-        warnings.warn("CLICKHOUSE_URL environment variable not set")
+    if get_log_sink_name() == 'clickhouse':
+        if os.getenv("CLICKHOUSE_URL") is not None:
+            db = get_database()
+            db.create_tables()
+        else:
+            warnings.warn("CLICKHOUSE_URL environment variable not set")
+    # Creating the sink here surfaces configuration errors at startup
+    sink = get_log_sink()
+    if sink is not None:
+        await sink.start()
     yield
+    await close_log_sinks()
 
 
 app = FastAPI(lifespan=lifespan)
 
 app.include_router(process_data_router)
+# Log inspection only makes sense for the in-memory sink
+if logging_enabled() and get_log_sink_name() == 'memory':
+    app.include_router(admin_router)
 
 
 @app.exception_handler(Exception)
@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class LogRecord(BaseModel):
+    id: str
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    endpoint: str
+    input_data: str
+    output_data: Optional[str] = None
+    status: str
+    error_message: Optional[str] = None
@@ -1,17 +1,27 @@
 import json
 import os
+import threading
 import uuid
 from typing import Any, Dict, Optional
 
 from fastapi import Depends
 
-from app.models.database.logging.request_log import RequestLog
+from app.models.pydantic.logging.log_record import LogRecord
 from app.services.database import Database, get_database
+from app.services.logging_service.sinks import LogSink, ClickHouseLogSink, MemoryLogSink, ParquetLogSink
+
+LOG_SINKS = ('clickhouse', 'parquet', 'memory')
+
+# Buffering sinks must outlive a single request, so they are created once per process
+_shared_sinks: Dict[str, LogSink] = {}
+_shared_sinks_lock = threading.Lock()
 
 
 class LoggingService:
-    def __init__(self, db: Database = None, enabled: bool = True):
-        self.db = db
+    def __init__(self, db: Database = None, enabled: bool = True, sink: LogSink = None):
+        if sink is None and db is not None:
+            sink = ClickHouseLogSink(db)
+        self.sink = sink
         self.enabled = enabled
 
     async def log_request(
@@ -25,32 +35,84 @@ class LoggingService:
         if not self.enabled:
             return None
 
-        if self.db is None:
-            print("Warning: Database not available for logging")
+        if self.sink is None:
+            print("Warning: Log sink not available for logging")
             return None
 
         log_id = str(uuid.uuid4())
-        with self.db.get_db() as db:
-            log_entry = RequestLog(
-                id=log_id,
-                endpoint=endpoint,
-                input_data=json.dumps(input_data),
-                output_data=json.dumps(output_data) if output_data else None,
-                status=status,
-                error_message=error_message
-            )
-            db.add(log_entry)
-            db.commit()
+        await self.sink.write(LogRecord(
+            id=log_id,
+            endpoint=endpoint,
+            input_data=json.dumps(input_data),
+            output_data=json.dumps(output_data) if output_data else None,
+            status=status,
+            error_message=error_message
+        ))
 
         return log_id
 
 
-def get_logging_service(db: Database = Depends(get_database)) -> LoggingService:
-    enabled = os.getenv("LOGGING_ENABLED", "true").lower() == "true"
+def get_log_sink_name() -> str:
+    name = os.getenv("LOG_SINK", "clickhouse").lower()
+    if name not in LOG_SINKS:
+        raise ValueError(f"Unknown LOG_SINK '{name}', expected one of: {', '.join(LOG_SINKS)}")
+    return name
+
+
+def _positive_env(name: str, default: str, cast=int):
+    value = cast(os.getenv(name, default))
+    if value <= 0:
+        raise ValueError(f"{name} must be greater than zero, got {value}")
+    return value
+
+
+def _create_shared_sink(name: str) -> LogSink:
+    if name == 'memory':
+        return MemoryLogSink(capacity=_positive_env("LOG_MEMORY_CAPACITY", "1000"))
+    return ParquetLogSink(
+        directory=os.getenv("LOG_FILE_DIR", "logs"),
+        batch_size=_positive_env("LOG_FILE_BATCH_SIZE", "100"),
+        max_rows_per_file=_positive_env("LOG_FILE_MAX_ROWS", "100000"),
+        rotate_seconds=_positive_env("LOG_FILE_ROTATE_SECONDS", "300", float),
+        flush_seconds=_positive_env("LOG_FILE_FLUSH_SECONDS", "10", float),
+    )
+
+
+def logging_enabled() -> bool:
+    return os.getenv("LOGGING_ENABLED", "true").lower() == "true"
+
+
+def get_log_sink() -> Optional[LogSink]:
+    """Return the log sink selected by the LOG_SINK environment variable, or None when logging is disabled"""
+    if not logging_enabled():
+        return None
+
+    name = get_log_sink_name()
+    if name == 'clickhouse':
+        return ClickHouseLogSink(get_database())
+
+    with _shared_sinks_lock:
+        if name not in _shared_sinks:
+            _shared_sinks[name] = _create_shared_sink(name)
+        return _shared_sinks[name]
+
+
+async def close_log_sinks() -> None:
+    """Flush and drop all shared sinks, called on application shutdown"""
+    with _shared_sinks_lock:
+        sinks = list(_shared_sinks.values())
+        _shared_sinks.clear()
+    # Every sink gets a chance to flush even if an earlier one fails
+    error = None
+    for sink in sinks:
+        try:
+            await sink.close()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
 
-    if not enabled:
-        # Return logging service without database when disabled
-        return LoggingService(db=None, enabled=False)
 
-    # Use the injected database instance when logging is enabled
-    return LoggingService(db=db, enabled=True)
+def get_logging_service(sink: Optional[LogSink] = Depends(get_log_sink)) -> LoggingService:
+    # A missing sink means logging is disabled
+    return LoggingService(sink=sink, enabled=sink is not None)
@@ -0,0 +1,238 @@
+import asyncio
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from app.models.database.logging.request_log import RequestLog
+from app.models.pydantic.logging.log_record import LogRecord
+from app.services.database import Database
+
+
+class LogSink(ABC):
+    """Base class for request log storage backends"""
+
+    @abstractmethod
+    async def write(self, record: LogRecord) -> None:
+        """Store a single request log record"""
+
+    async def start(self) -> None:
+        """Start background work, called on application startup"""
+
+    async def close(self) -> None:
+        """Flush pending records and release resources"""
+
+
+class ClickHouseLogSink(LogSink):
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def write(self, record: LogRecord) -> None:
+        with self.db.get_db() as db:
+            # The timestamp is left to the column's server default
+            log_entry = RequestLog(**record.model_dump(exclude={'timestamp'}))
+            db.add(log_entry)
+            db.commit()
+
+
+class MemoryLogSink(LogSink):
+    """Bounded ring buffer keeping the most recent records, for tests and debugging"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._records: deque = deque(maxlen=capacity)
+
+    async def write(self, record: LogRecord) -> None:
+        self._records.append(record)
+
+    def get_records(self, limit: Optional[int] = None, status: Optional[str] = None) -> List[LogRecord]:
+        """Return stored records, newest first"""
+        records = [r for r in reversed(self._records) if status is None or r.status == status]
+        return records if limit is None else records[:limit]
+
+    def clear(self) -> None:
+        self._records.clear()
+
+
+class ParquetLogSink(LogSink):
+    """Buffers records and writes them to rotating Parquet files as row groups.
+
+    A file is only readable once its footer is written, so files are written under a
+    temporary suffix and renamed when closed. Files are closed after max_rows_per_file
+    rows or rotate_seconds, and buffered records are flushed after flush_seconds at most,
+    so a crash loses at most one rotation interval of logs.
+    """
+
+    TMP_SUFFIX = '.tmp'
+    CORRUPT_SUFFIX = '.corrupt'
+
+    def __init__(self, directory: str, batch_size: int = 100, max_rows_per_file: int = 100_000,
+                 rotate_seconds: float = 300.0, flush_seconds: float = 10.0):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("pyarrow is required for the parquet log sink, "
+                              "install it with 'pip install -r requirements-parquet.txt'") from e
+
+        self._pa = pa
+        self._pq = pq
+        self.schema = pa.schema([
+            ('id', pa.string()),
+            ('timestamp', pa.timestamp('us', tz='UTC')),
+            ('endpoint', pa.string()),
+            ('input_data', pa.string()),
+            ('output_data', pa.string()),
+            ('status', pa.string()),
+            ('error_message', pa.string()),
+        ])
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.max_rows_per_file = max_rows_per_file
+        self.rotate_seconds = rotate_seconds
+        self.flush_seconds = flush_seconds
+
+        self._buffer: List[LogRecord] = []
+        self._buffer_started: Optional[float] = None
+        self._writer = None
+        self._path: Optional[Path] = None
+        self._file_opened: Optional[float] = None
+        self._rows_in_file = 0
+        # Keeps batches in order on the event loop side
+        self._write_lock = asyncio.Lock()
+        # Guards the writer state, which is only touched from worker threads
+        self._file_lock = threading.Lock()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self._recover_tmp_files()
+
+    async def write(self, record: LogRecord) -> None:
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            await self._flush()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            # Let the loop finish an in-flight flush instead of cancelling it
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self._flush(rotate=True)
+
+    async def flush_expired(self) -> None:
+        """Flush buffered records and rotate the current file once their time limits pass"""
+        now = time.monotonic()
+        buffer_expired = bool(self._buffer) and now - self._buffer_started >= self.flush_seconds
+        file_expired = self._file_opened is not None and now - self._file_opened >= self.rotate_seconds
+        if buffer_expired or file_expired:
+            await self._flush(rotate=file_expired)
+
+    async def _run(self) -> None:
+        interval = min(self.flush_seconds, self.rotate_seconds)
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush_expired()
+            except Exception as e:
+                print(f"Warning: failed to write parquet logs: {e}")
+
+    async def _flush(self, rotate: bool = False) -> None:
+        # Take the buffer before waiting for the lock so batches keep their order
+        records, self._buffer = self._buffer, []
+        self._buffer_started = None
+        async with self._write_lock:
+            await asyncio.to_thread(self._write_records, records, rotate)
+
+    def _write_records(self, records: List[LogRecord], rotate: bool) -> None:
+        with self._file_lock:
+            self._write_records_locked(records, rotate)
+
+    def _write_records_locked(self, records: List[LogRecord], rotate: bool) -> None:
+        if records:
+            if self._writer is None:
+                self._open_file()
+            table = self._pa.Table.from_pylist([r.model_dump() for r in records], schema=self.schema)
+            try:
+                self._writer.write_table(table)
+            except Exception:
+                # Keep the rows already written and start a fresh file on the next write
+                try:
+                    self._close_file()
+                except Exception as e:
+                    print(f"Warning: failed to close parquet log file after a write error: {e}")
+                raise
+            self._rows_in_file += len(records)
+
+        if rotate or self._rows_in_file >= self.max_rows_per_file:
+            self._close_file()
+
+    def _open_file(self) -> None:
+        # The pid keeps names unique across workers and tells recovery who owns a file
+        name = f"request_logs_{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}_{os.getpid()}.parquet"
+        self._path = self.directory / name
+        self._writer = self._pq.ParquetWriter(str(self._path) + self.TMP_SUFFIX, self.schema)
+        self._file_opened = time.monotonic()
+        self._rows_in_file = 0
+
+    def _close_file(self) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._writer.close()
+            Path(str(self._path) + self.TMP_SUFFIX).rename(self._path)
+        finally:
+            # A failed close must not leave a dead writer behind for later writes
+            self._writer = None
+            self._path = None
+            self._file_opened = None
+            self._rows_in_file = 0
+
+    def _recover_tmp_files(self) -> None:
+        """Publish complete temporary files left by dead processes and quarantine broken ones"""
+        for tmp_path in self.directory.glob('*.parquet' + self.TMP_SUFFIX):
+            path = tmp_path.with_suffix('')
+            if self._owner_alive(path):
+                continue
+            try:
+                self._pq.ParquetFile(tmp_path).close()
+            except Exception:
+                print(f"Warning: quarantining unreadable log file {tmp_path}")
+                tmp_path.rename(str(path) + self.CORRUPT_SUFFIX)
+            else:
+                tmp_path.rename(path)
+
+    @staticmethod
+    def _owner_alive(path: Path) -> bool:
+        """Whether another live process may still be writing the file"""
+        try:
+            pid = int(path.stem.rsplit('_', 1)[-1])
+        except ValueError:
+            return False
+        # A process has a single shared sink, so files with our own pid were left
+        # by a previous run, e.g. a restarted container where the server is pid 1
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
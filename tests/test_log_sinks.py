@@ -0,0 +1,306 @@
+import asyncio
+import importlib
+import os
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.pydantic.logging.log_record import LogRecord
+from app.models.pydantic.process_data.external_api_response import ExternalAPIResponse
+from app.services.logging_service.service import LoggingService, get_log_sink, close_log_sinks, _shared_sinks
+from app.services.logging_service.sinks import LogSink, ClickHouseLogSink, MemoryLogSink, ParquetLogSink
+
+
+def make_record(log_id: str, status: str = "success") -> LogRecord:
+    return LogRecord(id=log_id, endpoint="/test", input_data='{"test": "data"}', status=status)
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_sinks():
+    """Drop process-wide sinks between tests"""
+    asyncio.run(close_log_sinks())
+    yield
+    asyncio.run(close_log_sinks())
+
+
+class TestMemoryLogSink:
+    @pytest.mark.asyncio
+    async def test_records_newest_first(self):
+        sink = MemoryLogSink(capacity=10)
+        for i in range(3):
+            await sink.write(make_record(str(i)))
+
+        assert [r.id for r in sink.get_records()] == ["2", "1", "0"]
+        assert [r.id for r in sink.get_records(limit=2)] == ["2", "1"]
+
+    @pytest.mark.asyncio
+    async def test_capacity_is_bounded(self):
+        sink = MemoryLogSink(capacity=2)
+        for i in range(5):
+            await sink.write(make_record(str(i)))
+
+        assert [r.id for r in sink.get_records()] == ["4", "3"]
+
+    @pytest.mark.asyncio
+    async def test_filter_by_status(self):
+        sink = MemoryLogSink()
+        await sink.write(make_record("ok"))
+        await sink.write(make_record("failed", status="error"))
+
+        assert [r.id for r in sink.get_records(status="error")] == ["failed"]
+
+    @pytest.mark.asyncio
+    async def test_logging_service_writes_to_sink(self):
+        sink = MemoryLogSink()
+        service = LoggingService(sink=sink, enabled=True)
+
+        log_id = await service.log_request(
+            endpoint="/test",
+            input_data={"test": "data"},
+            output_data={"result": "success"}
+        )
+
+        records = sink.get_records()
+        assert len(records) == 1
+        assert records[0].id == log_id
+        assert records[0].output_data == '{"result": "success"}'
+
+
+class TestParquetLogSink:
+    @pytest.fixture(autouse=True)
+    def require_pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    @pytest.mark.asyncio
+    async def test_writes_in_batches(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        sink = ParquetLogSink(str(tmp_path), batch_size=2)
+        await sink.write(make_record("0"))
+        assert not list(tmp_path.glob("*.parquet"))
+
+        await sink.write(make_record("1"))
+        await sink.write(make_record("2"))
+        await sink.close()
+
+        files = list(tmp_path.glob("*.parquet"))
+        assert len(files) == 1
+        assert pq.read_table(files[0]).column("id").to_pylist() == ["0", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_rotates_files(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        sink = ParquetLogSink(str(tmp_path), batch_size=1, max_rows_per_file=2)
+        for i in range(5):
+            await sink.write(make_record(str(i)))
+        await sink.close()
+
+        files = sorted(tmp_path.glob("*.parquet"))
+        assert [pq.read_table(f).num_rows for f in files] == [2, 2, 1]
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_file_visible_without_close(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        sink = ParquetLogSink(str(tmp_path), batch_size=100, rotate_seconds=0.05, flush_seconds=0.05)
+        await sink.start()
+        try:
+            await sink.write(make_record("0"))
+            for _ in range(50):
+                files = list(tmp_path.glob("*.parquet"))
+                if files:
+                    break
+                await asyncio.sleep(0.02)
+
+            assert len(files) == 1
+            assert pq.read_table(files[0]).column("id").to_pylist() == ["0"]
+        finally:
+            await sink.close()
+
+    @pytest.mark.asyncio
+    async def test_close_during_slow_flush(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        sink = ParquetLogSink(str(tmp_path), rotate_seconds=60, flush_seconds=0.01)
+        write_records = sink._write_records_locked
+        flush_started = threading.Event()
+        active = []
+        overlaps = []
+
+        def slow_write_records(records, rotate):
+            overlaps.append(len(active))
+            active.append(None)
+            try:
+                if records:
+                    flush_started.set()
+                    time.sleep(0.2)
+                write_records(records, rotate)
+            finally:
+                active.pop()
+
+        sink._write_records_locked = slow_write_records
+        await sink.start()
+        await sink.write(make_record("0"))
+        await asyncio.to_thread(flush_started.wait, 5)
+        await sink.write(make_record("1"))
+        await sink.close()
+
+        assert max(overlaps) == 0
+        files = sorted(tmp_path.glob("*.parquet"))
+        assert [i for f in files for i in pq.read_table(f).column("id").to_pylist()] == ["0", "1"]
+
+    @pytest.mark.asyncio
+    async def test_write_after_failed_rotation(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        sink = ParquetLogSink(str(tmp_path), batch_size=1, max_rows_per_file=1)
+        with patch('app.services.logging_service.sinks.Path.rename', side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                await sink.write(make_record("0"))
+
+        await sink.write(make_record("1"))
+        await sink.close()
+
+        files = list(tmp_path.glob("*.parquet"))
+        assert len(files) == 1
+        assert pq.read_table(files[0]).column("id").to_pylist() == ["1"]
+
+    @pytest.mark.asyncio
+    async def test_recovers_leftover_tmp_files(self, tmp_path):
+        sink = ParquetLogSink(str(tmp_path), batch_size=1)
+        await sink.write(make_record("0"))
+        # Simulate a crash after the file was closed but before it was renamed
+        sink._writer.close()
+        # pid above the Linux pid_max limit, so its owner is certainly gone
+        broken = "request_logs_20260101T000000000000_4194305.parquet"
+        (tmp_path / f"{broken}.tmp").write_bytes(b"PAR1 truncated")
+
+        ParquetLogSink(str(tmp_path))
+
+        assert len(list(tmp_path.glob("*.parquet"))) == 1
+        assert (tmp_path / f"{broken}.corrupt").exists()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_keeps_tmp_files_of_live_processes(self, tmp_path):
+        live = tmp_path / f"request_logs_20260101T000000000000_{os.getppid()}.parquet.tmp"
+        live.write_bytes(b"PAR1 in progress")
+
+        ParquetLogSink(str(tmp_path))
+
+        assert live.exists()
+        assert not list(tmp_path.glob("*.corrupt"))
+
+
+class TestLogSinkSelection:
+    def test_default_is_clickhouse(self):
+        with patch.dict(os.environ, {}, clear=True), \
+                patch('app.services.logging_service.service.get_database'):
+            assert isinstance(get_log_sink(), ClickHouseLogSink)
+
+    def test_incomplete_sink_cannot_be_created(self):
+        class IncompleteLogSink(LogSink):
+            pass
+
+        with pytest.raises(TypeError):
+            IncompleteLogSink()
+
+    def test_memory_sink_is_shared(self):
+        with patch.dict(os.environ, {"LOG_SINK": "memory"}):
+            sink = get_log_sink()
+            assert isinstance(sink, MemoryLogSink)
+            assert get_log_sink() is sink
+
+    def test_disabled_logging_has_no_sink(self):
+        with patch.dict(os.environ, {"LOGGING_ENABLED": "false", "LOG_SINK": "memory"}):
+            assert get_log_sink() is None
+
+    def test_dependency_override_replaces_request_logger(self):
+        sink = MemoryLogSink()
+        app.dependency_overrides[get_log_sink] = lambda: sink
+        try:
+            with patch('app.services.process_data_service.service.ProcessDataService.fetch_cat_fact',
+                       return_value=ExternalAPIResponse(fact="Cats are awesome!", length=18)):
+                response = TestClient(app).post("/process_data", json={"test": "data"})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert [r.status for r in sink.get_records()] == ["success"]
+
+    def test_unknown_sink(self):
+        with patch.dict(os.environ, {"LOG_SINK": "redis"}):
+            with pytest.raises(ValueError, match="Unknown LOG_SINK"):
+                get_log_sink()
+
+    def test_invalid_config_fails_at_startup(self):
+        with patch.dict(os.environ, {"LOG_SINK": "memory", "LOG_MEMORY_CAPACITY": "many"}):
+            with pytest.raises(ValueError):
+                with TestClient(app):
+                    pass
+
+    @pytest.mark.parametrize("name, value", [
+        ("LOG_MEMORY_CAPACITY", "0"),
+        ("LOG_FILE_BATCH_SIZE", "0"),
+        ("LOG_FILE_MAX_ROWS", "-1"),
+        ("LOG_FILE_ROTATE_SECONDS", "0"),
+        ("LOG_FILE_FLUSH_SECONDS", "-0.5"),
+    ])
+    def test_non_positive_settings_rejected(self, tmp_path, name, value):
+        sink = "memory" if name == "LOG_MEMORY_CAPACITY" else "parquet"
+        with patch.dict(os.environ, {"LOG_SINK": sink, "LOG_FILE_DIR": str(tmp_path), name: value}):
+            with pytest.raises(ValueError, match=f"{name} must be greater than zero"):
+                get_log_sink()
+
+    def test_close_continues_after_failure(self):
+        failing = MemoryLogSink()
+        failing.close = AsyncMock(side_effect=OSError("disk full"))
+        other = MemoryLogSink()
+        other.close = AsyncMock()
+        _shared_sinks.update(parquet=failing, memory=other)
+
+        with pytest.raises(OSError, match="disk full"):
+            asyncio.run(close_log_sinks())
+
+        other.close.assert_awaited_once()
+        assert not _shared_sinks
+
+
+class TestAdminLogsEndpoint:
+    @staticmethod
+    def reload_app():
+        import app.main
+        return importlib.reload(app.main).app
+
+    @pytest.fixture(autouse=True)
+    def restore_app(self):
+        yield
+        self.reload_app()
+
+    def test_logs_from_memory_sink(self):
+        with patch.dict(os.environ, {"LOG_SINK": "memory"}):
+            client = TestClient(self.reload_app())
+            with patch('app.services.process_data_service.service.ProcessDataService.fetch_cat_fact',
+                       side_effect=Exception("External API failed")):
+                client.post("/process_data", json={"test": "data"})
+
+            response = client.get("/admin/logs", params={"status": "error"})
+
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data) == 1
+            assert data[0]["endpoint"] == "/process_data"
+            assert data[0]["error_message"] == "External API failed"
+
+    def test_logs_not_mounted_for_other_sinks(self):
+        with patch.dict(os.environ, {"LOG_SINK": "clickhouse"}):
+            client = TestClient(self.reload_app())
+            response = client.get("/admin/logs")
+
+            assert response.status_code == 404
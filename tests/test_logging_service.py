@@ -40,6 +40,16 @@ class TestLoggingService:
         session.add.assert_called_once()
         session.commit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_log_request_uses_server_timestamp(self, mock_database):
+        db, session = mock_database
+        service = LoggingService(db, enabled=True)
+
+        await service.log_request(endpoint="/test", input_data={"test": "data"})
+
+        log_entry = session.add.call_args.args[0]
+        assert log_entry.timestamp is None
+
     @pytest.mark.asyncio
     async def test_log_request_disabled(self, mock_database):
         db, session = mock_database